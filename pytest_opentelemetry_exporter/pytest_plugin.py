@@ -1,45 +1,71 @@
 # pytest_otel_plugin.py
 
-import json
+import functools
+import itertools
 import logging
 import os
+import random
 import sqlite3
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
 
-import backoff
+import msgspec
 import pytest
 import requests
+from requests.adapters import HTTPAdapter
 
 from pytest_opentelemetry_exporter.request_extractor import BusinessHttpRequest, extract_business_http_requests
+from pytest_opentelemetry_exporter.types import BatchesDataStruct, decode_batches
+
+# Trust boundary: trace data comes from the collector that the test environment controls, so we treat it as trusted.
+# It is decoded straight into the Structs from `types.py` (`decode_batches`) with no Python-level validation and is
+# never constructed into the models from `models.py`. Validation only belongs where user-provided data enters the plugin.
 
-# Shared lists to keep track of generated IDs
-trace_ids = []
-span_ids = []
 DB_DIRECTORY = Path("otel_test_traces")
 DB_FILE = DB_DIRECTORY / f"traces_{uuid.uuid4()}.sqlite3"
+_json_encoder = msgspec.json.Encoder()
+MAX_FETCH_WORKERS = 32
+FETCH_RETRY_MAX_TIME = 10  # seconds
+INSERT_TRACE = "INSERT OR IGNORE INTO trace_ids (id) VALUES (?)"
+INSERT_SPAN = "INSERT OR IGNORE INTO span_ids (id) VALUES (?)"
+INSERT_TRACE_DATA = "INSERT OR REPLACE INTO traces_data (trace_id, json_data) VALUES (?, ?)"
+# SQLite can't bind table names, so each table gets its own statement (which sqlite3 caches once prepared)
+_INSERT_ID_STATEMENTS = {"trace_ids": INSERT_TRACE, "span_ids": INSERT_SPAN}
+# The connection is shared by the whole session and is closed in `pytest_sessionfinish`
+_DB_CONNECTION_KEY = pytest.StashKey[sqlite3.Connection]()
+
+# A single session lets all fetches reuse pooled keep-alive connections to the query endpoint. Each fetch worker
+# holds at most one connection, so the pool is sized to the workers. Retries are left to `fetch_trace_data`.
+_session = requests.Session()
+_adapter = HTTPAdapter(pool_connections=MAX_FETCH_WORKERS, pool_maxsize=MAX_FETCH_WORKERS, max_retries=0)
+_session.mount("http://", _adapter)
+_session.mount("https://", _adapter)
 
 
 def get_db_connection() -> sqlite3.Connection:
-    """Establish a connection to the shared SQLite database."""
-    return sqlite3.connect(DB_FILE)
+    """Establish a connection to the shared SQLite database.
+
+    The connection is in autocommit mode so that we control the transactions explicitly."""
+    return sqlite3.connect(DB_FILE, isolation_level=None)
 
 
 def save_id_to_db(conn: sqlite3.Connection, table_name: str, id_value: str):
-    """Save the generated ID to the specified table in the SQLite database."""
-    cursor = conn.cursor()
-    # Insert the ID into the table
-    cursor.execute("INSERT OR IGNORE INTO ? (id) VALUES (?)", (table_name, id_value))
-    conn.commit()
+    """Save the generated ID to the specified table in the SQLite database.
+
+    The insert joins the transaction that spans the whole session and is committed in `pytest_sessionfinish`."""
+    conn.execute(_INSERT_ID_STATEMENTS[table_name], (id_value,))
 
 
 @pytest.fixture(scope="session", autouse=True)
-def _setup_db():
-    """Set up the database before running tests."""
+def otel_db_connection(request: pytest.FixtureRequest) -> sqlite3.Connection:
+    """Set up the database before running tests and share its connection with the whole session."""
     DB_DIRECTORY.mkdir(exist_ok=True)
     conn = get_db_connection()
     cursor = conn.cursor()
+    cursor.executescript("PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL; PRAGMA temp_store=MEMORY;")
     # Create the tables if they don't exist
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS trace_ids (
@@ -51,65 +77,98 @@ def _setup_db():
             id TEXT PRIMARY KEY
         )
     """)
-    conn.commit()
-    try:
-        yield conn
-    finally:
-        conn.close()
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS traces_data (
+            trace_id TEXT PRIMARY KEY,
+            json_data BLOB
+        )
+    """)
+    # All of the session's writes go into a single transaction so that they cost a single fsync
+    conn.execute("BEGIN")
+    request.session.stash[_DB_CONNECTION_KEY] = conn
+    return conn
 
 
 @pytest.fixture
-def trace_id(conn: sqlite3.Connection):
+def trace_id(otel_db_connection: sqlite3.Connection):
     """Generate a unique trace_id, save it to the database, and yield it."""
     # Generate a UUID for trace_id
-    trace_id = str(uuid.uuid4())
+    trace_id = uuid.uuid4().hex
     # Save it to the database beforehand
-    save_id_to_db(conn, "trace_ids", trace_id)
-    # Append to the list for use after tests
-    trace_ids.append(trace_id)
+    save_id_to_db(otel_db_connection, "trace_ids", trace_id)
     return trace_id
 
 
 @pytest.fixture
-def span_id(conn: sqlite3.Connection):
+def span_id(otel_db_connection: sqlite3.Connection):
     """Generate a unique span_id, save it to the database, and yield it."""
-    # Generate a UUID for span_id
-    span_id = str(uuid.uuid4())
+    # Generate a random span_id. Unlike trace ids, span ids are 8 bytes, so a UUID doesn't fit
+    span_id = os.urandom(8).hex()
     # Save it to the database beforehand
-    save_id_to_db(conn, "span_ids", span_id)
-    # Append to the list for use after tests
-    span_ids.append(span_id)
+    save_id_to_db(otel_db_connection, "span_ids", span_id)
     return span_id
 
 
-# Define a function with retries using exponential backoff and jitter
-@backoff.on_exception(backoff.expo, requests.exceptions.RequestException, max_time=10, jitter=backoff.random_jitter)
-def fetch_trace_data(url: str):
-    response = requests.get(url, timeout=15)
-    response.raise_for_status()
-    return response.json()
+def fetch_trace_data(url: str) -> BatchesDataStruct:
+    """Fetch the trace data, retrying failed requests with exponential backoff and jitter."""
+    deadline = time.monotonic() + FETCH_RETRY_MAX_TIME
+    for attempt in itertools.count():  # pragma: no branch
+        try:
+            response = _session.get(url, timeout=15)
+            response.raise_for_status()
+            break
+        except requests.exceptions.RequestException:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise
+            time.sleep(min(2**attempt + random.random(), remaining))  # noqa: S311
+    return decode_batches(response.content)
 
 
-def pytest_sessionfinish(session: Any, exitstatus: Any):
+def pytest_sessionfinish(session: pytest.Session, exitstatus: Any):
     """Hook that runs after the entire test session finishes."""
+    conn = session.stash.get(_DB_CONNECTION_KEY, None)
+    if conn is None:
+        return
+    try:
+        export_traces(conn)
+    finally:
+        # The ids are worth keeping even if the export fails
+        conn.execute("COMMIT")
+        conn.close()
+
+
+def export_traces(conn: sqlite3.Connection):
+    """Fetch the traces of the generated trace ids and save their summaries to the database."""
     # Get the endpoint from the environment variable
     endpoint = os.environ.get("PYTEST_OTEL_EXPORT_QUERY_ENDPOINT")
     if not endpoint:
         logging.warning("Environment variable PYTEST_OTEL_EXPORT_QUERY_ENDPOINT is not set.")
         return
 
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    # Fetches are I/O-bound, so we overlap them in threads and only write to the database from the main thread
+    trace_ids = (row[0] for row in conn.execute("SELECT id FROM trace_ids"))
+    with ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS) as executor:
+        # Rows are written as they arrive so only the traces that are currently in flight are held in memory
+        rows = executor.map(functools.partial(summarize_trace, endpoint), trace_ids)
+        # These rows join the session's transaction together with the ids. The traces that couldn't be fetched or
+        # decoded have no row
+        conn.executemany(INSERT_TRACE_DATA, filter(None, rows))
 
-    for trace_id in trace_ids:
-        url = f"{endpoint}/api/traces/{trace_id}"
-        json_data = fetch_trace_data(url)
-        summarized_json_data: list[BusinessHttpRequest] = extract_business_http_requests(json_data)
-        # Save the JSON data to the database
-        cursor.execute(
-            "INSERT OR REPLACE INTO traces_data (trace_id, json_data) VALUES (?, ?)",
-            (trace_id, json.dumps({"data": summarized_json_data})),
-        )
 
-    conn.commit()
-    conn.close()
+def summarize_trace(endpoint: str, trace_id: str) -> Optional[tuple[str, bytes]]:
+    """Fetch a trace and encode its summary, letting go of the full trace as soon as it is summarized.
+
+    Returns None if the trace can't be fetched (e.g. a test that requested a trace id never emitted a span, so the
+    query responds with a 404) or decoded so that a single bad trace doesn't fail the whole export."""
+    try:
+        json_data = fetch_trace_data(f"{endpoint}/api/traces/{trace_id}")
+    except requests.exceptions.RequestException as e:
+        logging.warning("Skipping trace %s because it couldn't be fetched: %s", trace_id, e)
+        return None
+    except msgspec.DecodeError as e:
+        logging.warning("Skipping trace %s because it couldn't be decoded: %s", trace_id, e)
+        return None
+    summarized_json_data: list[BusinessHttpRequest] = extract_business_http_requests(json_data)
+    # Save the JSON data to the database as a BLOB to skip the utf-8 round trip
+    return trace_id, _json_encoder.encode({"data": summarized_json_data})
@@ -1,6 +1,58 @@
-from typing import Any, Optional, TypedDict
+import dataclasses
+import sys
+from array import array
+from collections import Counter
+from collections.abc import Iterator
+from typing import TYPE_CHECKING, Any, Final, Optional
 
-from pytest_opentelemetry_exporter.types import BatchesData, KeyValue, SpanKind
+import msgspec
+
+from pytest_opentelemetry_exporter.types import (
+    AnyValue,
+    AnyValueStruct,
+    BatchesData,
+    BatchesDataLike,
+    BatchesDataStruct,
+    KeyValue,
+    KeyValueStruct,
+    SpanKind,
+)
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+SPAN_KIND_SERVER: Final = "SPAN_KIND_SERVER"
+_SPAN_KIND_SERVER_NUMBER: Final = 2
+_STR: Final = "stringValue"
+_INT: Final = "intValue"
+_DOUBLE: Final = "doubleValue"
+_INT64_MIN: Final = -(2**63)
+_INT64_MAX: Final = 2**63 - 1
+# The attribute keys we extract. Interned so that the lookup sets and the accessors share a single object per key
+SERVICE_NAME: Final = sys.intern("service.name")
+HTTP_METHOD: Final = sys.intern("http.method")
+HTTP_URL: Final = sys.intern("http.url")
+HTTP_STATUS_CODE: Final = sys.intern("http.status_code")
+_HTTP_ATTRIBUTE_KEYS: Final = frozenset((HTTP_METHOD, HTTP_URL, HTTP_STATUS_CODE))
+_SERVICE_ATTRIBUTE_KEYS: Final = frozenset((SERVICE_NAME,))
+# The services whose requests aren't business requests by default: the API gateway only forwards them
+SKIPPED_SERVICES: Final = frozenset(("kong",))
+# The instrumentation scopes of the OpenTelemetry Python instrumentations that create HTTP server spans.
+# Pass them (or your own set) as `scope_names` to skip the spans of every other named scope without looking at them
+HTTP_SERVER_SCOPES: Final = frozenset(
+    (
+        "opentelemetry.instrumentation.aiohttp_server",
+        "opentelemetry.instrumentation.asgi",
+        "opentelemetry.instrumentation.django",
+        "opentelemetry.instrumentation.falcon",
+        "opentelemetry.instrumentation.fastapi",
+        "opentelemetry.instrumentation.flask",
+        "opentelemetry.instrumentation.pyramid",
+        "opentelemetry.instrumentation.starlette",
+        "opentelemetry.instrumentation.tornado",
+        "opentelemetry.instrumentation.wsgi",
+    )
+)
 
 
 def get_attribute(attributes: list[KeyValue], key: str) -> Any:
@@ -10,17 +62,119 @@ def get_attribute(attributes: list[KeyValue], key: str) -> Any:
     """
     for attr in attributes:
         if attr["key"] == key:
-            value = attr["value"]
-            if "stringValue" in value:
-                return value["stringValue"]
-            elif "intValue" in value:
-                return int(value["intValue"])
-            elif "doubleValue" in value:
-                return float(value["doubleValue"])
+            return _get_value(attr["value"])
+    return None
+
+
+def _get_value(value: AnyValue) -> Any:
+    if _STR in value:
+        return value[_STR]
+    elif _INT in value:
+        # OTLP/JSON encodes int64 values as strings, so intValue is still a str unless the decoder converted it
+        return int(value[_INT])
+    elif _DOUBLE in value:
+        # Whole numbers decode to ints and OTLP/JSON writes NaN and Infinity as strings
+        return float(value[_DOUBLE])
     return None
 
 
-class BusinessHttpRequest(TypedDict):
+def _to_int(value: Any) -> Optional[int]:
+    # Some instrumentations record numbers as strings (or doubles), which we still report as ints
+    # so that the field has the same type for every span
+    try:
+        number = int(value)
+    except (TypeError, ValueError, OverflowError):  # OverflowError is for the infinite doubles
+        return None
+    # Nothing stops a span from carrying a number that doesn't fit the int64 of intValue
+    return number if _INT64_MIN <= number <= _INT64_MAX else None
+
+
+# The accessors below are for keys whose value type we know upfront, so they read that type directly
+# and only fall back to the generic dispatch when the span carries an unexpected type. Each of them comes
+# in two flavors: one for the plain dicts of `BatchesData` and one for the Structs of `BatchesDataStruct`.
+
+
+def _pluck(attributes: list[KeyValue], wanted: frozenset[str]) -> dict[str, AnyValue]:
+    """Index only the wanted attributes, stopping as soon as all of them were found."""
+    found: dict[str, AnyValue] = {}
+    for attr in attributes:
+        key = attr["key"]
+        if key in wanted:
+            found[key] = attr["value"]
+            if len(found) == len(wanted):
+                break
+    return found
+
+
+def _get_raw_value(value: AnyValue) -> Any:
+    if _STR in value:
+        return value[_STR]
+    elif _INT in value:
+        return _to_int(value[_INT])
+    return value.get(_DOUBLE)
+
+
+def _str_attr(attributes: dict[str, AnyValue], key: str) -> Optional[str]:
+    value = attributes.get(key)
+    if value is None:
+        return None
+    try:
+        return value[_STR]
+    except KeyError:
+        return _get_raw_value(value)
+
+
+def _int_attr(attributes: dict[str, AnyValue], key: str) -> Optional[int]:
+    value = attributes.get(key)
+    if value is None:
+        return None
+    try:
+        # OTLP/JSON encodes int64 values as strings
+        return _to_int(value[_INT])
+    except KeyError:
+        return _to_int(_get_raw_value(value))
+
+
+def _pluck_struct(attributes: list[KeyValueStruct], wanted: frozenset[str]) -> dict[str, AnyValueStruct]:
+    found: dict[str, AnyValueStruct] = {}
+    for attr in attributes:
+        key = attr.key
+        if key in wanted:
+            found[key] = attr.value
+            if len(found) == len(wanted):
+                break
+    return found
+
+
+def _get_struct_value(value: AnyValueStruct) -> Any:
+    if value.stringValue is not None:
+        return value.stringValue
+    elif value.intValue is not None:
+        return value.intValue
+    return value.doubleValue
+
+
+def _str_struct_attr(attributes: dict[str, AnyValueStruct], key: str) -> Optional[str]:
+    value = attributes.get(key)
+    if value is None:
+        return None
+    string_value = value.stringValue
+    return string_value if string_value is not None else _get_struct_value(value)
+
+
+def _int_struct_attr(attributes: dict[str, AnyValueStruct], key: str) -> Optional[int]:
+    value = attributes.get(key)
+    if value is None:
+        return None
+    int_value = value.intValue
+    return _to_int(int_value if int_value is not None else _get_struct_value(value))
+
+
+class BusinessHttpRequest(msgspec.Struct, frozen=True):
+    """The details of an HTTP request received by one of the services.
+
+    Use `msgspec.structs.asdict` to get it as a dict."""
+
     trace_id: str
     span_id: str
     parent_span_id: Optional[str]
@@ -34,69 +188,284 @@ class BusinessHttpRequest(TypedDict):
     http_status_code: Optional[int]
 
 
-def extract_business_http_requests(data: BatchesData) -> list[BusinessHttpRequest]:
+_BUSINESS_HTTP_REQUEST_FIELDS: Final = len(BusinessHttpRequest.__struct_fields__)
+
+
+class BusinessHttpRequestColumns(msgspec.Struct, frozen=True):
+    """The same details as `BusinessHttpRequest`, stored as one list per field for all of the requests.
+
+    Use `to_records` to get them back as `BusinessHttpRequest`s."""
+
+    trace_id: list[str]
+    span_id: list[str]
+    parent_span_id: list[Optional[str]]
+    service_name: list[Optional[str]]
+    span_name: list[str]
+    kind: list[Optional[SpanKind]]
+    start_time_unix_nano: list[int]
+    end_time_unix_nano: list[int]
+    http_method: list[Optional[str]]
+    http_url: list[Optional[str]]
+    http_status_code: list[Optional[int]]
+
+    def to_records(self) -> list[BusinessHttpRequest]:
+        return [BusinessHttpRequest(*row) for row in zip(*msgspec.structs.astuple(self))]
+
+
+@dataclasses.dataclass
+class HttpRequestsAggregate:
+    """Summary statistics of the HTTP requests received by the services.
+
+    `counts` is the number of requests per `(service_name, http_status_code)` and `durations_unix_nano` holds the
+    duration of each request (in the order of the spans) as signed 64-bit integers. It is a plain dataclass rather than
+    a Struct because neither of them can be encoded to JSON as is."""
+
+    counts: Counter[tuple[Optional[str], Optional[int]]]
+    durations_unix_nano: array
+
+
+def extract_business_http_requests(
+    data: BatchesDataLike,
+    scope_names: Optional[frozenset[str]] = None,
+    skip_services: frozenset[str] = SKIPPED_SERVICES,
+) -> list[BusinessHttpRequest]:
     """
+    Accepts both the plain dicts (`BatchesData`, such as the output of `json.loads`) and the Structs from
+    `decode_batches` (`BatchesDataStruct`), and extracts the same values from both.
+
+    Args:
+        data: The batches of a trace.
+        scope_names: If given and non-empty, the spans of the scopes with a name outside of it (such as
+            `HTTP_SERVER_SCOPES`) are skipped. The spans of scopes without a name are always extracted.
+        skip_services: The names of the services whose spans are skipped.
+
     Returns:
-        list: A list of dictionaries containing extracted HTTP request details.
+        list: A list of the extracted HTTP request details.
     """
-    business_http_requests: list[BusinessHttpRequest] = []
+    return list(iter_business_http_requests(data, scope_names, skip_services))
+
+
+def iter_business_http_requests(
+    data: BatchesDataLike,
+    scope_names: Optional[frozenset[str]] = None,
+    skip_services: frozenset[str] = SKIPPED_SERVICES,
+) -> Iterator[BusinessHttpRequest]:
+    """
+    Lazy version of `extract_business_http_requests` for callers that can process
+    the requests one by one without holding all of them in memory.
+
+    Yields:
+        BusinessHttpRequest: The extracted HTTP request details of each HTTP server span.
+    """
+    for row in _iter_business_http_request_rows(data, scope_names, skip_services):
+        yield BusinessHttpRequest(*row)
+
+
+def extract_business_http_requests_arrow(
+    data: BatchesDataLike,
+    scope_names: Optional[frozenset[str]] = None,
+    skip_services: frozenset[str] = SKIPPED_SERVICES,
+) -> "pa.Table":
+    """
+    Columnar version of `extract_business_http_requests` for bulk analysis of large traces.
+    Requires the `arrow` extra (pyarrow).
+
+    Returns:
+        pyarrow.Table: A table with one column per `BusinessHttpRequest` field and one row per request.
+    """
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise ImportError(
+            "extract_business_http_requests_arrow requires pyarrow. "
+            "Install it with `pip install pytest-opentelemetry-exporter[arrow]`."
+        ) from e
+
+    schema = pa.schema(
+        [
+            ("trace_id", pa.string()),
+            ("span_id", pa.string()),
+            ("parent_span_id", pa.string()),
+            ("service_name", pa.string()),
+            ("span_name", pa.string()),
+            ("kind", pa.string()),
+            ("start_time_unix_nano", pa.int64()),
+            ("end_time_unix_nano", pa.int64()),
+            ("http_method", pa.string()),
+            ("http_url", pa.string()),
+            ("http_status_code", pa.int64()),
+        ]
+    )
+    columns = msgspec.structs.astuple(extract_business_http_requests_columns(data, scope_names, skip_services))
+    return pa.Table.from_arrays(
+        [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+        schema=schema,
+    )
+
+
+def extract_business_http_requests_columns(
+    data: BatchesDataLike,
+    scope_names: Optional[frozenset[str]] = None,
+    skip_services: frozenset[str] = SKIPPED_SERVICES,
+) -> BusinessHttpRequestColumns:
+    """
+    Columnar version of `extract_business_http_requests` that keeps one list per field instead of one object per
+    request, which is cheaper to aggregate over (e.g. by zipping two of the columns).
+
+    Returns:
+        BusinessHttpRequestColumns: The extracted HTTP request details.
+    """
+    columns = BusinessHttpRequestColumns(*([] for _ in range(_BUSINESS_HTTP_REQUEST_FIELDS)))
+    # Each row is appended as soon as it is yielded so that we never hold all of the rows at once
+    appends = [column.append for column in msgspec.structs.astuple(columns)]
+    for row in _iter_business_http_request_rows(data, scope_names, skip_services):
+        for append, value in zip(appends, row):
+            append(value)
+    return columns
+
+
+def aggregate_http_requests(
+    data: BatchesDataLike,
+    scope_names: Optional[frozenset[str]] = None,
+    skip_services: frozenset[str] = SKIPPED_SERVICES,
+) -> HttpRequestsAggregate:
+    """
+    Version of `extract_business_http_requests` for callers that only need counts and latencies. It walks
+    the same spans but accumulates them as it goes instead of keeping the details of every request.
+
+    Returns:
+        HttpRequestsAggregate: The request counts and durations.
+    """
+    counts: Counter[tuple[Optional[str], Optional[int]]] = Counter()
+    durations = array("q")
+    rows = _iter_business_http_request_rows(data, scope_names, skip_services)
+    for _, _, _, service_name, _, _, start_time, end_time, _, _, http_status_code in rows:
+        counts[service_name, http_status_code] += 1
+        durations.append(end_time - start_time)
+    return HttpRequestsAggregate(counts, durations)
+
+
+def _iter_business_http_request_rows(
+    data: BatchesDataLike, scope_names: Optional[frozenset[str]], skip_services: frozenset[str]
+) -> Iterator[tuple[Any, ...]]:
+    """Yield the fields of each HTTP server span in the order of `BusinessHttpRequest` fields."""
+    # Each form gets its own walk so that both of them only ever look at the fields they need
+    if isinstance(data, BatchesDataStruct):
+        return _iter_business_http_request_rows_from_structs(data, scope_names, skip_services)
+    return _iter_business_http_request_rows_from_dicts(data, scope_names, skip_services)
+
+
+def _iter_business_http_request_rows_from_dicts(
+    data: BatchesData, scope_names: Optional[frozenset[str]], skip_services: frozenset[str]
+) -> Iterator[tuple[Any, ...]]:
+    # Proto3 JSON leaves out the fields that hold their default value, so every field we read falls back to it
 
     # Iterate through each batch
-    for batch in data["batches"]:
+    for batch in data.get("batches", []):
         resource = batch.get("resource", {})
-        attributes = resource.get("attributes", {})
+        # service.name is the only resource attribute we need, so we stop scanning them as soon as we find it
+        resource_attributes = _pluck(resource.get("attributes", []), _SERVICE_ATTRIBUTE_KEYS)
 
-        # Get the service name
-        service_name = get_attribute(attributes, "service.name")
+        # Get the service name once per batch: all of its spans share it
+        service_name = _str_attr(resource_attributes, SERVICE_NAME)
 
-        # Skip batches related to Kong
-        if service_name == "kong":
+        # Skip batches of the services we don't care about (e.g. Kong) without walking their spans
+        if service_name in skip_services:
             continue
 
         # Iterate through scopeSpans
-        for scope_span in batch.get("scopeSpans"):
-            spans = scope_span.get("spans")
+        for scope_span in batch.get("scopeSpans", []):
+            # Skip whole scopes that can't hold the spans we want before walking their spans
+            if scope_names:
+                scope_name = scope_span.get("scope", {}).get("name")
+                if scope_name and scope_name not in scope_names:
+                    continue
 
-            for span in spans:
-                span_attributes = span.get("attributes", [])
+            for span in scope_span.get("spans", []):
+                # We only care about spans that receive requests, not the spans that send them.
+                # This is the cheapest check and it discards most spans, so it goes before any attribute work
+                kind = span.get("kind")
+                if kind != SPAN_KIND_SERVER:
+                    # Proto3 JSON may also carry enums by their number
+                    if kind != _SPAN_KIND_SERVER_NUMBER:
+                        continue
+                    kind = SPAN_KIND_SERVER
+
+                span_attributes = _pluck(span.get("attributes", []), _HTTP_ATTRIBUTE_KEYS)
 
                 # Check if the span has an HTTP method attribute
-                http_method = get_attribute(span_attributes, "http.method")
+                http_method = _str_attr(span_attributes, HTTP_METHOD)
                 if not http_method:
                     continue  # Skip non-HTTP spans
 
                 # Extract relevant HTTP attributes
-                http_url: str = get_attribute(span_attributes, "http.url")
-                http_status_code: int = get_attribute(span_attributes, "http.status_code")
+                http_url = _str_attr(span_attributes, HTTP_URL)
+                http_status_code = _int_attr(span_attributes, HTTP_STATUS_CODE)
 
-                # Extract additional span details
-                trace_id = span.get("traceId")
-                span_id = span.get("spanId")
+                # Extract additional span details. OTLP/JSON encodes the timestamps as strings
+                trace_id = span.get("traceId", "")
+                span_id = span.get("spanId", "")
                 parent_span_id = span.get("parentSpanId")
-                name = span.get("name")
-                kind = span.get("kind")
-                start_time = span.get("startTimeUnixNano")
-                end_time = span.get("endTimeUnixNano")
+                name = span.get("name", "")
+                start_time = int(span.get("startTimeUnixNano", 0))
+                end_time = int(span.get("endTimeUnixNano", 0))
 
-                # We only care about spans that receive requests, not the spans that send them
-                if kind != "SPAN_KIND_SERVER":
+                yield (
+                    trace_id,
+                    span_id,
+                    parent_span_id,
+                    service_name,
+                    name,
+                    kind,
+                    start_time,
+                    end_time,
+                    http_method,
+                    http_url,
+                    http_status_code,
+                )
+
+
+def _iter_business_http_request_rows_from_structs(
+    data: BatchesDataStruct, scope_names: Optional[frozenset[str]], skip_services: frozenset[str]
+) -> Iterator[tuple[Any, ...]]:
+    # The same walk as `_iter_business_http_request_rows_from_dicts`, using attribute access on the Structs
+    for batch in data.batches:
+        resource = batch.resource
+        resource_attributes = (
+            _pluck_struct(resource.attributes, _SERVICE_ATTRIBUTE_KEYS) if resource is not None else {}
+        )
+        service_name = _str_struct_attr(resource_attributes, SERVICE_NAME)
+        if service_name in skip_services:
+            continue
+
+        for scope_span in batch.scopeSpans:
+            if scope_names and scope_span.scope is not None:
+                scope_name = scope_span.scope.name
+                if scope_name and scope_name not in scope_names:
                     continue
 
-                # Append the extracted information to the list
-                business_http_requests.append(
-                    {
-                        "trace_id": trace_id,
-                        "span_id": span_id,
-                        "parent_span_id": parent_span_id,
-                        "service_name": service_name,
-                        "span_name": name,
-                        "kind": kind,
-                        "start_time_unix_nano": start_time,
-                        "end_time_unix_nano": end_time,
-                        "http_method": http_method,
-                        "http_url": http_url,
-                        "http_status_code": http_status_code,
-                    }
-                )
+            for span in scope_span.spans:
+                kind = span.kind
+                if kind != SPAN_KIND_SERVER:
+                    if kind != _SPAN_KIND_SERVER_NUMBER:
+                        continue
+                    kind = SPAN_KIND_SERVER
 
-    return business_http_requests
+                span_attributes = _pluck_struct(span.attributes, _HTTP_ATTRIBUTE_KEYS)
+                http_method = _str_struct_attr(span_attributes, HTTP_METHOD)
+                if not http_method:
+                    continue
+
+                yield (
+                    span.traceId,
+                    span.spanId,
+                    span.parentSpanId,
+                    service_name,
+                    span.name,
+                    kind,
+                    span.startTimeUnixNano,
+                    span.endTimeUnixNano,
+                    http_method,
+                    _str_struct_attr(span_attributes, HTTP_URL),
+                    _int_struct_attr(span_attributes, HTTP_STATUS_CODE),
+                )
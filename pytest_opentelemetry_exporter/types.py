@@ -1,5 +1,6 @@
-from typing import Literal, TypedDict
+from typing import Literal, Optional, TypedDict, Union
 
+import msgspec
 from typing_extensions import NotRequired
 
 # Constants for Span flags
@@ -166,3 +167,149 @@ class TracesData(TypedDict):
 
 class BatchesData(TypedDict):
     batches: list[ResourceSpans]
+
+
+# The same types as msgspec Structs, so that a query response can be decoded straight into objects with C-backed
+# attribute access instead of dicts. Proto3 JSON leaves out the fields that hold their default value (such as an
+# empty span name or a resource without attributes), so every field defaults to its proto3 default instead of being
+# required. The enums also accept the numeric values that proto3 JSON allows and the names that newer versions of the
+# spec may add, so no legal payload fails to decode.
+
+
+class AnyValueStruct(msgspec.Struct):
+    """`AnyValue` as a Struct. The fields that aren't set are None."""
+
+    stringValue: Optional[str] = None
+    boolValue: Optional[bool] = None
+    intValue: Optional[int] = None
+    doubleValue: Optional[float] = None
+    arrayValue: Optional["ArrayValueStruct"] = None
+    kvlistValue: Optional["KeyValueListStruct"] = None
+    bytesValue: Optional[str] = None
+
+
+class ArrayValueStruct(msgspec.Struct):
+    """`ArrayValue` as a Struct."""
+
+    values: list[AnyValueStruct] = []
+
+
+class KeyValueStruct(msgspec.Struct):
+    """`KeyValue` as a Struct."""
+
+    key: str = ""
+    value: AnyValueStruct = msgspec.field(default_factory=AnyValueStruct)
+
+
+class KeyValueListStruct(msgspec.Struct):
+    """`KeyValueList` as a Struct."""
+
+    values: list[KeyValueStruct] = []
+
+
+class ResourceStruct(msgspec.Struct):
+    """`Resource` as a Struct."""
+
+    attributes: list[KeyValueStruct] = []
+    droppedAttributesCount: int = 0
+
+
+class InstrumentationScopeStruct(msgspec.Struct):
+    """`InstrumentationScope` as a Struct."""
+
+    name: str = ""
+    version: str = ""
+    attributes: list[KeyValueStruct] = []
+    droppedAttributesCount: int = 0
+
+
+class StatusStruct(msgspec.Struct):
+    """`Status` as a Struct."""
+
+    message: str = ""
+    code: Union[str, int, None] = None
+
+
+class EventStruct(msgspec.Struct):
+    """`Event` as a Struct."""
+
+    timeUnixNano: int = 0
+    name: str = ""
+    attributes: list[KeyValueStruct] = []
+    droppedAttributesCount: int = 0
+
+
+class LinkStruct(msgspec.Struct):
+    """`Link` as a Struct."""
+
+    traceId: str = ""
+    spanId: str = ""
+    traceState: str = ""
+    attributes: list[KeyValueStruct] = []
+    droppedAttributesCount: int = 0
+    flags: int = 0
+
+
+class SpanStruct(msgspec.Struct):
+    """`Span` as a Struct. `kind` is None when it isn't set."""
+
+    traceId: str = ""
+    spanId: str = ""
+    traceState: str = ""
+    parentSpanId: Optional[str] = None
+    flags: int = 0
+    name: str = ""
+    kind: Union[str, int, None] = None
+    startTimeUnixNano: int = 0
+    endTimeUnixNano: int = 0
+    attributes: list[KeyValueStruct] = []
+    droppedAttributesCount: int = 0
+    links: list[LinkStruct] = []
+    droppedLinksCount: int = 0
+    status: Optional[StatusStruct] = None
+    events: list[EventStruct] = []
+    droppedEventsCount: int = 0
+
+
+class ScopeSpansStruct(msgspec.Struct):
+    """`ScopeSpans` as a Struct."""
+
+    scope: Optional[InstrumentationScopeStruct] = None
+    spans: list[SpanStruct] = []
+    schemaUrl: str = ""
+
+
+class ResourceSpansStruct(msgspec.Struct):
+    """`ResourceSpans` as a Struct."""
+
+    resource: Optional[ResourceStruct] = None
+    scopeSpans: list[ScopeSpansStruct] = []
+    schemaUrl: str = ""
+
+
+class BatchesDataStruct(msgspec.Struct):
+    """`BatchesData` as a Struct."""
+
+    batches: list[ResourceSpansStruct] = []
+
+
+BatchesDataLike = Union[BatchesData, BatchesDataStruct]
+
+# Not strict for the same reason as the decoders in `models`
+_batches_decoder = msgspec.json.Decoder(BatchesDataStruct, strict=False)
+
+
+def decode_batches(raw: bytes) -> BatchesDataStruct:
+    """Decode a trace query response (a list of batches) from JSON.
+
+    Raises `msgspec.DecodeError` if the response isn't JSON or doesn't follow the schema."""
+    return _batches_decoder.decode(raw)
+
+
+def to_batches_struct(data: BatchesDataLike) -> BatchesDataStruct:
+    """Convert an already-parsed trace query response (such as the output of `json.loads`) into Structs.
+
+    Raises `msgspec.ValidationError` if it doesn't follow the schema."""
+    if isinstance(data, BatchesDataStruct):
+        return data
+    return msgspec.convert(data, BatchesDataStruct, strict=False)
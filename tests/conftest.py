@@ -0,0 +1,129 @@
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+import pytest
+
+pytest_plugins = ["pytester"]
+
+
+TRACE_ID = "5b8efff798038103d269b633813fc60c"
+SPAN_ID = "eee19b7ec3c1b174"
+PARENT_SPAN_ID = "eee19b7ec3c1b173"
+
+
+def string_attribute(key: str, value: str) -> dict[str, Any]:
+    return {"key": key, "value": {"stringValue": value}}
+
+
+def server_span(**fields: Any) -> dict[str, Any]:
+    """An HTTP server span as OTLP/JSON writes it: int64 fields are strings."""
+    return {
+        "traceId": TRACE_ID,
+        "spanId": SPAN_ID,
+        "name": "GET /users",
+        "kind": "SPAN_KIND_SERVER",
+        "startTimeUnixNano": "1000",
+        "endTimeUnixNano": "3000",
+        "attributes": [
+            string_attribute("http.method", "GET"),
+            string_attribute("http.url", "http://api/users"),
+            {"key": "http.status_code", "value": {"intValue": "200"}},
+        ],
+        **fields,
+    }
+
+
+@pytest.fixture
+def batches() -> dict[str, Any]:
+    """A trace query response with one span for every case that the extraction handles differently."""
+    return {
+        "batches": [
+            {
+                "resource": {
+                    "attributes": [string_attribute("host.name", "api-1"), string_attribute("service.name", "api")]
+                },
+                "scopeSpans": [
+                    {
+                        "scope": {"name": "opentelemetry.instrumentation.fastapi"},
+                        "spans": [
+                            server_span(parentSpanId=PARENT_SPAN_ID),
+                            # Not a server span
+                            server_span(kind="SPAN_KIND_CLIENT"),
+                            # A server span that isn't an HTTP request
+                            server_span(attributes=[string_attribute("rpc.method", "Get")]),
+                        ],
+                    },
+                    {
+                        "scope": {"name": "custom"},
+                        "spans": [server_span(name="POST /orders", kind=2)],
+                    },
+                    {
+                        # Proto3 JSON leaves out every field that holds its default value
+                        "spans": [
+                            {
+                                "traceId": TRACE_ID,
+                                "spanId": SPAN_ID,
+                                "kind": 2,
+                                "attributes": [string_attribute("http.method", "GET")],
+                            },
+                        ],
+                    },
+                ],
+            },
+            {
+                "resource": {"attributes": [string_attribute("service.name", "kong")]},
+                "scopeSpans": [{"spans": [server_span()]}],
+            },
+            {
+                "scopeSpans": [{"scope": {}, "spans": [server_span(name="GET /health")]}],
+            },
+        ]
+    }
+
+
+class StubQueryServer:
+    """An HTTP server that answers every trace query with the queued responses, repeating the last one."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.requested_paths: list[str] = []
+        self._responses: list[tuple[int, bytes]] = [(200, b'{"batches": []}')]
+
+    def respond(self, *responses: tuple[int, bytes]):
+        self._responses = list(responses)
+
+    def next_response(self, path: str) -> tuple[int, bytes]:
+        self.requested_paths.append(path)
+        if len(self._responses) > 1:
+            return self._responses.pop(0)
+        return self._responses[0]
+
+
+@pytest.fixture
+def query_server() -> Iterator[StubQueryServer]:
+    stub: StubQueryServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):  # noqa: N802
+            status, body = stub.next_response(self.path)
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    stub = StubQueryServer(f"http://127.0.0.1:{server.server_address[1]}")
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    try:
+        yield stub
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
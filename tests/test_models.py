@@ -0,0 +1,98 @@
+import msgspec
+import pytest
+
+from pytest_opentelemetry_exporter.models import (
+    AnyValue,
+    KeyValue,
+    Link,
+    Resource,
+    ResourceSpans,
+    ScopeSpans,
+    Span,
+    SpanKind,
+    TracesData,
+    decode_traces_data,
+    encode,
+)
+from tests.conftest import SPAN_ID, TRACE_ID
+
+# The example from the OTLP/JSON section of the OTLP spec, without the fields that hold their default value
+TRACES_DATA = b"""{
+  "resourceSpans": [
+    {
+      "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": "my.service"}}]},
+      "scopeSpans": [
+        {
+          "scope": {"name": "my.library", "version": "1.0.0"},
+          "spans": [
+            {
+              "traceId": "5b8efff798038103d269b633813fc60c",
+              "spanId": "eee19b7ec3c1b174",
+              "parentSpanId": "eee19b7ec3c1b173",
+              "name": "I'm a server span",
+              "startTimeUnixNano": "1544712660000000000",
+              "endTimeUnixNano": "1544712661000000000",
+              "kind": "SPAN_KIND_SERVER",
+              "attributes": [{"key": "my.span.attr", "value": {"intValue": "42"}}]
+            },
+            {"traceId": "5b8efff798038103d269b633813fc60c", "spanId": "eee19b7ec3c1b175"}
+          ]
+        },
+        {}
+      ]
+    },
+    {}
+  ]
+}"""
+
+
+def test__decode_traces_data():
+    data = decode_traces_data(TRACES_DATA)
+    [resource_spans, empty_resource_spans] = data.resourceSpans
+    assert resource_spans.resource == Resource((KeyValue("service.name", AnyValue(stringValue="my.service")),))
+    [scope_spans, empty_scope_spans] = resource_spans.scopeSpans
+    [span, unnamed_span] = scope_spans.spans
+    assert span.kind is SpanKind.SPAN_KIND_SERVER
+    assert span.startTimeUnixNano == 1544712660000000000
+    assert span.attributes == (KeyValue("my.span.attr", AnyValue(intValue=42)),)
+    assert (unnamed_span.name, unnamed_span.startTimeUnixNano, unnamed_span.endTimeUnixNano) == ("", 0, 0)
+    assert empty_scope_spans == ScopeSpans()
+    assert empty_resource_spans == ResourceSpans()
+
+
+def test__encode__leaves_out_default_values():
+    data = TracesData((ResourceSpans(scopeSpans=(ScopeSpans(spans=(Span(traceId=TRACE_ID, spanId=SPAN_ID),)),)),))
+    assert (
+        encode(data)
+        == f'{{"resourceSpans":[{{"scopeSpans":[{{"spans":[{{"traceId":"{TRACE_ID}","spanId":"{SPAN_ID}"}}]}}]}}]}}'.encode()
+    )
+    assert decode_traces_data(encode(data)) == data
+
+
+@pytest.mark.parametrize("model", [Span, Link])
+@pytest.mark.parametrize(
+    ("trace_id", "span_id", "message"),
+    [
+        (TRACE_ID[:-2], SPAN_ID, "traceId must be a 16-byte array"),
+        (TRACE_ID, SPAN_ID + "00", "spanId must be a 8-byte array"),
+        (TRACE_ID[:-1] + "x", SPAN_ID, "traceId must be hex-encoded"),
+        (TRACE_ID, SPAN_ID[:-1] + "x", "spanId must be hex-encoded"),
+    ],
+)
+def test__ids_are_validated(model: type[msgspec.Struct], trace_id: str, span_id: str, message: str):
+    with pytest.raises(ValueError, match=message):
+        model(traceId=trace_id, spanId=span_id)
+    raw = msgspec.json.encode({"traceId": trace_id, "spanId": span_id})
+    with pytest.raises(msgspec.ValidationError, match=message):
+        msgspec.json.decode(raw, type=model)
+
+
+def test__any_value__allows_a_single_field():
+    assert encode(AnyValue()) == b"{}"
+    with pytest.raises(ValueError, match="Only one of the fields in AnyValue can be set"):
+        AnyValue(stringValue="a", intValue=1)
+
+
+def test__from_dict():
+    span = Span(traceId=TRACE_ID, spanId=SPAN_ID)
+    assert ScopeSpans.from_dict({"spans": (span,)}) == ScopeSpans(spans=(span,))
@@ -0,0 +1,121 @@
+import json
+import logging
+import sqlite3
+import time
+from typing import Any
+
+import pytest
+
+from pytest_opentelemetry_exporter import pytest_plugin
+from tests.conftest import StubQueryServer
+
+PLUGIN = "pytest_opentelemetry_exporter.pytest_plugin"
+
+TESTS = """
+def test_trace(trace_id):
+    assert len(trace_id) == 32
+
+
+def test_trace_and_span(trace_id, span_id):
+    assert len(span_id) == 16
+"""
+
+
+@pytest.fixture
+def endpoint(monkeypatch: pytest.MonkeyPatch, query_server: StubQueryServer) -> StubQueryServer:
+    monkeypatch.setenv("PYTEST_OTEL_EXPORT_QUERY_ENDPOINT", query_server.url)
+    return query_server
+
+
+def run(pytester: pytest.Pytester) -> dict[str, list[tuple[Any, ...]]]:
+    """Run the tests with the plugin and return the rows of each table of the database they produced."""
+    pytester.makepyfile(TESTS)
+    result = pytester.runpytest_inprocess("-p", PLUGIN)
+    result.assert_outcomes(passed=2)
+    [db_file] = (pytester.path / "otel_test_traces").glob("traces_*.sqlite3")
+    conn = sqlite3.connect(db_file)
+    try:
+        return {
+            table: conn.execute(f"SELECT * FROM {table}").fetchall()
+            for table in ("trace_ids", "span_ids", "traces_data")
+        }
+    finally:
+        conn.close()
+
+
+def test__export(pytester: pytest.Pytester, endpoint: StubQueryServer, batches: dict[str, Any]):
+    endpoint.respond((200, json.dumps(batches).encode()))
+    tables = run(pytester)
+
+    trace_ids = sorted(trace_id for (trace_id,) in tables["trace_ids"])
+    assert len(trace_ids) == 2
+    assert [len(span_id) for (span_id,) in tables["span_ids"]] == [16]
+    assert sorted(endpoint.requested_paths) == [f"/api/traces/{trace_id}" for trace_id in trace_ids]
+    assert sorted(trace_id for trace_id, _ in tables["traces_data"]) == trace_ids
+    for _, json_data in tables["traces_data"]:
+        summary = json.loads(json_data)["data"]
+        assert [request["span_name"] for request in summary] == ["GET /users", "POST /orders", "", "GET /health"]
+        assert summary[0]["http_status_code"] == 200
+
+
+def test__export__retries_failed_fetches(
+    pytester: pytest.Pytester, monkeypatch: pytest.MonkeyPatch, endpoint: StubQueryServer, batches: dict[str, Any]
+):
+    sleeps: list[float] = []
+    monkeypatch.setattr(time, "sleep", sleeps.append)
+    # Both traces fail once before they succeed
+    endpoint.respond((503, b""), (503, b""), (200, json.dumps(batches).encode()))
+    tables = run(pytester)
+
+    assert len(sleeps) == 2
+    assert len(endpoint.requested_paths) == 4
+    assert len(tables["traces_data"]) == 2
+
+
+@pytest.mark.parametrize(
+    ("response", "reason"),
+    [((404, b"trace not found"), "couldn't be fetched"), ((200, b"not json"), "couldn't be decoded")],
+    ids=["not-found", "undecodable"],
+)
+def test__export__skips_bad_traces(
+    pytester: pytest.Pytester,
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+    endpoint: StubQueryServer,
+    response: tuple[int, bytes],
+    reason: str,
+):
+    monkeypatch.setattr(pytest_plugin, "FETCH_RETRY_MAX_TIME", 0)
+    endpoint.respond(response)
+    with caplog.at_level(logging.WARNING):
+        tables = run(pytester)
+
+    # The ids are kept, only the summaries of the bad traces are missing
+    assert len(tables["trace_ids"]) == 2
+    assert len(tables["span_ids"]) == 1
+    assert tables["traces_data"] == []
+    assert caplog.text.count(reason) == 2
+
+
+def test__export__without_endpoint(
+    pytester: pytest.Pytester,
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+    query_server: StubQueryServer,
+):
+    monkeypatch.delenv("PYTEST_OTEL_EXPORT_QUERY_ENDPOINT", raising=False)
+    with caplog.at_level(logging.WARNING):
+        tables = run(pytester)
+
+    assert len(tables["trace_ids"]) == 2
+    assert tables["traces_data"] == []
+    assert query_server.requested_paths == []
+    assert "PYTEST_OTEL_EXPORT_QUERY_ENDPOINT is not set" in caplog.text
+
+
+def test__export__without_tests(pytester: pytest.Pytester, endpoint: StubQueryServer):
+    result = pytester.runpytest_inprocess("-p", PLUGIN)
+    result.assert_outcomes()
+
+    assert not (pytester.path / "otel_test_traces").exists()
+    assert endpoint.requested_paths == []
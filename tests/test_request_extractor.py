@@ -0,0 +1,187 @@
+import json
+import math
+import sys
+from array import array
+from collections import Counter
+from typing import Any, Callable
+
+import msgspec
+import pytest
+
+from pytest_opentelemetry_exporter.request_extractor import (
+    HTTP_SERVER_SCOPES,
+    BusinessHttpRequest,
+    aggregate_http_requests,
+    extract_business_http_requests,
+    extract_business_http_requests_arrow,
+    extract_business_http_requests_columns,
+    get_attribute,
+    iter_business_http_requests,
+)
+from pytest_opentelemetry_exporter.types import decode_batches
+from tests.conftest import PARENT_SPAN_ID, SPAN_ID, TRACE_ID, server_span, string_attribute
+
+USERS = BusinessHttpRequest(
+    TRACE_ID,
+    SPAN_ID,
+    PARENT_SPAN_ID,
+    "api",
+    "GET /users",
+    "SPAN_KIND_SERVER",
+    1000,
+    3000,
+    "GET",
+    "http://api/users",
+    200,
+)
+ORDERS = BusinessHttpRequest(
+    TRACE_ID, SPAN_ID, None, "api", "POST /orders", "SPAN_KIND_SERVER", 1000, 3000, "GET", "http://api/users", 200
+)
+DEFAULTS = BusinessHttpRequest(TRACE_ID, SPAN_ID, None, "api", "", "SPAN_KIND_SERVER", 0, 0, "GET", None, None)
+KONG = BusinessHttpRequest(
+    TRACE_ID, SPAN_ID, None, "kong", "GET /users", "SPAN_KIND_SERVER", 1000, 3000, "GET", "http://api/users", 200
+)
+HEALTH = BusinessHttpRequest(
+    TRACE_ID, SPAN_ID, None, None, "GET /health", "SPAN_KIND_SERVER", 1000, 3000, "GET", "http://api/users", 200
+)
+
+Parse = Callable[[dict[str, Any]], Any]
+
+
+def as_dicts(data: dict[str, Any]) -> Any:
+    return json.loads(json.dumps(data))
+
+
+def as_structs(data: dict[str, Any]) -> Any:
+    return decode_batches(json.dumps(data).encode())
+
+
+@pytest.fixture(params=[as_dicts, as_structs], ids=["dicts", "structs"])
+def parse(request: pytest.FixtureRequest) -> Parse:
+    """Both input forms must produce the same requests."""
+    return request.param
+
+
+def single_span(span: dict[str, Any]) -> dict[str, Any]:
+    return {"batches": [{"scopeSpans": [{"spans": [span]}]}]}
+
+
+def test__extract_business_http_requests(parse: Parse, batches: dict[str, Any]):
+    assert extract_business_http_requests(parse(batches)) == [USERS, ORDERS, DEFAULTS, HEALTH]
+
+
+def test__extract_business_http_requests__with_scope_names(parse: Parse, batches: dict[str, Any]):
+    assert extract_business_http_requests(parse(batches), HTTP_SERVER_SCOPES) == [USERS, DEFAULTS, HEALTH]
+
+
+def test__extract_business_http_requests__with_empty_scope_names(parse: Parse, batches: dict[str, Any]):
+    assert extract_business_http_requests(parse(batches), frozenset()) == [USERS, ORDERS, DEFAULTS, HEALTH]
+
+
+def test__extract_business_http_requests__without_skipped_services(parse: Parse, batches: dict[str, Any]):
+    requests = extract_business_http_requests(parse(batches), skip_services=frozenset())
+    assert requests == [USERS, ORDERS, DEFAULTS, KONG, HEALTH]
+
+
+def test__extract_business_http_requests__with_custom_skipped_services(parse: Parse, batches: dict[str, Any]):
+    requests = extract_business_http_requests(parse(batches), skip_services=frozenset(("api", "kong")))
+    assert requests == [HEALTH]
+
+
+def test__extract_business_http_requests__empty(parse: Parse):
+    assert extract_business_http_requests(parse({})) == []
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ({"intValue": "200"}, 200),
+        ({"intValue": 201}, 201),
+        ({"stringValue": "404"}, 404),
+        ({"doubleValue": 500.0}, 500),
+        ({"doubleValue": "NaN"}, None),
+        ({"doubleValue": "Infinity"}, None),
+        ({"intValue": "99999999999999999999"}, None),
+        ({"stringValue": "OK"}, None),
+        ({"boolValue": True}, None),
+        ({}, None),
+    ],
+)
+def test__extract_business_http_requests__status_code(parse: Parse, value: dict[str, Any], expected: Any):
+    span = server_span(attributes=[string_attribute("http.method", "GET"), {"key": "http.status_code", "value": value}])
+    [request] = extract_business_http_requests(parse(single_span(span)))
+    assert request.http_status_code == expected
+
+
+def test__extract_business_http_requests__infinite_status_code():
+    # Only the dicts built in Python can hold an infinite double, JSON can't
+    span = server_span(attributes=[string_attribute("http.method", "GET")])
+    span["attributes"].append({"key": "http.status_code", "value": {"doubleValue": math.inf}})
+    [request] = extract_business_http_requests(single_span(span))
+    assert request.http_status_code is None
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [({"intValue": "5"}, 5), ({"doubleValue": 1.5}, 1.5), ({"boolValue": True}, None)],
+)
+def test__extract_business_http_requests__non_string_url(parse: Parse, value: dict[str, Any], expected: Any):
+    span = server_span(attributes=[string_attribute("http.method", "GET"), {"key": "http.url", "value": value}])
+    [request] = extract_business_http_requests(parse(single_span(span)))
+    assert request.http_url == expected
+
+
+def test__iter_business_http_requests(parse: Parse, batches: dict[str, Any]):
+    requests = iter_business_http_requests(parse(batches))
+    assert next(requests) == USERS
+    assert list(requests) == [ORDERS, DEFAULTS, HEALTH]
+
+
+def test__extract_business_http_requests_columns(parse: Parse, batches: dict[str, Any]):
+    columns = extract_business_http_requests_columns(parse(batches))
+    assert columns.span_name == ["GET /users", "POST /orders", "", "GET /health"]
+    assert columns.http_status_code == [200, 200, None, 200]
+    assert columns.to_records() == [USERS, ORDERS, DEFAULTS, HEALTH]
+
+
+def test__extract_business_http_requests_arrow(parse: Parse, batches: dict[str, Any]):
+    table = extract_business_http_requests_arrow(parse(batches))
+    assert table.column_names == list(BusinessHttpRequest.__struct_fields__)
+    assert str(table.schema.field("http_status_code").type) == "int64"
+    assert table.to_pylist() == [msgspec.structs.asdict(r) for r in (USERS, ORDERS, DEFAULTS, HEALTH)]
+
+
+def test__extract_business_http_requests_arrow__empty(parse: Parse):
+    table = extract_business_http_requests_arrow(parse({}))
+    assert table.num_rows == 0
+    assert table.column_names == list(BusinessHttpRequest.__struct_fields__)
+
+
+def test__extract_business_http_requests_arrow__without_pyarrow(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    with pytest.raises(ImportError, match=r"pytest-opentelemetry-exporter\[arrow\]"):
+        extract_business_http_requests_arrow({"batches": []})
+
+
+def test__aggregate_http_requests(parse: Parse, batches: dict[str, Any]):
+    aggregate = aggregate_http_requests(parse(batches), skip_services=frozenset())
+    assert aggregate.counts == Counter({("api", 200): 2, ("api", None): 1, ("kong", 200): 1, (None, 200): 1})
+    assert aggregate.durations_unix_nano == array("q", [2000, 2000, 0, 2000, 2000])
+
+
+def test__get_attribute():
+    attributes = [
+        string_attribute("http.method", "GET"),
+        {"key": "http.status_code", "value": {"intValue": "200"}},
+        {"key": "ratio", "value": {"doubleValue": 1}},
+        {"key": "nan", "value": {"doubleValue": "NaN"}},
+        {"key": "flag", "value": {"boolValue": True}},
+    ]
+    assert get_attribute(attributes, "http.method") == "GET"
+    assert get_attribute(attributes, "http.status_code") == 200
+    ratio = get_attribute(attributes, "ratio")
+    assert ratio == 1.0
+    assert isinstance(ratio, float)
+    assert math.isnan(get_attribute(attributes, "nan"))
+    assert get_attribute(attributes, "flag") is None
+    assert get_attribute(attributes, "missing") is None
@@ -0,0 +1,54 @@
+import json
+from typing import Any
+
+import msgspec
+import pytest
+
+from pytest_opentelemetry_exporter.types import (
+    BatchesDataStruct,
+    ResourceSpansStruct,
+    ScopeSpansStruct,
+    SpanStruct,
+    decode_batches,
+    to_batches_struct,
+)
+from tests.conftest import SPAN_ID, TRACE_ID
+
+
+def test__decode_batches(batches: dict[str, Any]):
+    data = decode_batches(json.dumps(batches).encode())
+    span = data.batches[0].scopeSpans[0].spans[0]
+    assert span.startTimeUnixNano == 1000
+    assert span.attributes[2].value.intValue == 200
+    assert data.batches[0].scopeSpans[1].spans[0].kind == 2
+
+
+def test__decode_batches__applies_proto3_defaults():
+    data = decode_batches(b'{"batches": [{"scopeSpans": [{"spans": [{}]}]}, {}]}')
+    assert data == BatchesDataStruct(
+        [ResourceSpansStruct(scopeSpans=[ScopeSpansStruct(spans=[SpanStruct()])]), ResourceSpansStruct()]
+    )
+    span = data.batches[0].scopeSpans[0].spans[0]
+    assert (span.name, span.kind, span.startTimeUnixNano, span.attributes) == ("", None, 0, [])
+
+
+@pytest.mark.parametrize("raw", [b"not json", b'{"batches": {}}', b'{"batches": [{"scopeSpans": [{"spans": [1]}]}]}'])
+def test__decode_batches__invalid(raw: bytes):
+    with pytest.raises(msgspec.DecodeError):
+        decode_batches(raw)
+
+
+def test__to_batches_struct(batches: dict[str, Any]):
+    assert to_batches_struct(batches) == decode_batches(json.dumps(batches).encode())
+
+
+def test__to_batches_struct__returns_structs_as_is():
+    data = BatchesDataStruct(
+        [ResourceSpansStruct(scopeSpans=[ScopeSpansStruct(spans=[SpanStruct(TRACE_ID, SPAN_ID)])])]
+    )
+    assert to_batches_struct(data) is data
+
+
+def test__to_batches_struct__invalid():
+    with pytest.raises(msgspec.ValidationError):
+        to_batches_struct({"batches": [{"scopeSpans": "spans"}]})